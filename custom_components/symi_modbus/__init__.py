@@ -17,7 +17,6 @@ from homeassistant.const import (
     CONF_TIMEOUT,
     CONF_TYPE,
     EVENT_HOMEASSISTANT_STOP,
-    Platform,
 )
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import config_validation as cv
@@ -39,6 +38,7 @@ from .const import (
     CONF_SERIAL,
     CONF_STOPBITS,
     CONF_TCP,
+    DATA_HUBS_BY_NAME,
     DEFAULT_HUB,
     DEFAULT_SCAN_INTERVAL,
     DOMAIN,
@@ -50,11 +50,40 @@ from .modbus import ModbusHub
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS = [Platform.SWITCH]
+SERVICE_WRITE_REGISTER_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ADDRESS): cv.positive_int,
+        vol.Required(ATTR_VALUE): vol.Any(cv.positive_int, [cv.positive_int]),
+        vol.Required(ATTR_SLAVE): cv.positive_int,
+        vol.Optional(ATTR_HUB, default=DEFAULT_HUB): cv.string,
+    }
+)
+
+SERVICE_WRITE_COIL_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ADDRESS): cv.positive_int,
+        vol.Required(ATTR_STATE): vol.Any(cv.boolean, [cv.boolean]),
+        vol.Required(ATTR_SLAVE): cv.positive_int,
+        vol.Optional(ATTR_HUB, default=DEFAULT_HUB): cv.string,
+    }
+)
 
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     """Set up the Symi Modbus component."""
     hass.data[DOMAIN] = {}
+    
+    async def async_stop_hubs(event):
+        """Stop all hubs when Home Assistant stops."""
+        await asyncio.gather(
+            *(
+                hub.async_stop()
+                for hub in hass.data[DOMAIN].values()
+                if isinstance(hub, ModbusHub)
+            )
+        )
+    
+    # One listener for every hub rather than one per config entry
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, async_stop_hubs)
     return True
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -66,6 +95,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         return False
     
     hass.data[DOMAIN][entry.entry_id] = hub
+    # Hub names aren't unique across gateways, so keep every hub per name
+    hass.data[DOMAIN].setdefault(DATA_HUBS_BY_NAME, {}).setdefault(hub.name, []).append(hub)
     
     # Register service calls
     register_services(hass)
@@ -73,10 +104,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Set up platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     
-    # Register a callback for when Home Assistant stops
-    entry.async_on_unload(
-        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, hub.async_stop)
-    )
+    # Apply option changes without reconnecting
+    entry.async_on_unload(entry.add_update_listener(update_listener))
     
     return True
 
@@ -86,12 +115,31 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     
     if unload_ok:
         hub = hass.data[DOMAIN].pop(entry.entry_id)
+        hubs_by_name = hass.data[DOMAIN].get(DATA_HUBS_BY_NAME, {})
+        hubs = hubs_by_name.get(hub.name, [])
+        if hub in hubs:
+            hubs.remove(hub)
+        if not hubs:
+            hubs_by_name.pop(hub.name, None)
         await hub.async_stop()
     
     return unload_ok
 
+async def update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Handle options update."""
+    hub = hass.data[DOMAIN].get(entry.entry_id)
+    if hub is None:
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+    
+    hub.async_update_scan_interval(
+        entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+    )
+
 def register_services(hass):
     """Register Modbus services."""
+    if hass.services.has_service(DOMAIN, SERVICE_WRITE_REGISTER):
+        return
     
     async def async_write_register(service):
         """Write Modbus registers."""
@@ -100,14 +148,13 @@ def register_services(hass):
         value = service.data[ATTR_VALUE]
         hub_name = service.data.get(ATTR_HUB, DEFAULT_HUB)
         
-        # Find hub by name
-        for entry_id, hub in hass.data[DOMAIN].items():
-            if hub.name == hub_name:
-                # Not supported yet
-                _LOGGER.error("Write register service not implemented")
-                break
-        else:
+        hubs = hass.data[DOMAIN].get(DATA_HUBS_BY_NAME, {}).get(hub_name)
+        if not hubs:
             _LOGGER.error("Hub %s not found", hub_name)
+            return
+        
+        # Not supported yet
+        _LOGGER.error("Write register service not implemented")
 
     async def async_write_coil(service):
         """Write Modbus coil."""
@@ -116,42 +163,29 @@ def register_services(hass):
         state = service.data[ATTR_STATE]
         hub_name = service.data.get(ATTR_HUB, DEFAULT_HUB)
         
-        # Find hub by name
-        for entry_id, hub in hass.data[DOMAIN].items():
-            if hub.name == hub_name:
-                await hub.write_coil(unit, address, state)
-                break
-        else:
+        hubs = hass.data[DOMAIN].get(DATA_HUBS_BY_NAME, {}).get(hub_name)
+        if not hubs:
             _LOGGER.error("Hub %s not found", hub_name)
-
-    service_write_register_schema = vol.Schema(
-        {
-            vol.Required(ATTR_ADDRESS): cv.positive_int,
-            vol.Required(ATTR_VALUE): vol.Any(cv.positive_int, [cv.positive_int]),
-            vol.Required(ATTR_SLAVE): cv.positive_int,
-            vol.Optional(ATTR_HUB, default=DEFAULT_HUB): cv.string,
-        }
-    )
-
-    service_write_coil_schema = vol.Schema(
-        {
-            vol.Required(ATTR_ADDRESS): cv.positive_int,
-            vol.Required(ATTR_STATE): vol.Any(cv.boolean, [cv.boolean]),
-            vol.Required(ATTR_SLAVE): cv.positive_int,
-            vol.Optional(ATTR_HUB, default=DEFAULT_HUB): cv.string,
-        }
-    )
+            return
+        hub = hubs[0]
+        
+        # A list of states writes consecutive coils from address on; the hub
+        # batches them into a single frame
+        states = state if isinstance(state, list) else [state]
+        await asyncio.gather(
+            *(hub.write_coil(unit, address + i, value) for i, value in enumerate(states))
+        )
 
     hass.services.async_register(
         DOMAIN,
         SERVICE_WRITE_REGISTER,
         async_write_register,
-        schema=service_write_register_schema,
+        schema=SERVICE_WRITE_REGISTER_SCHEMA,
     )
 
     hass.services.async_register(
         DOMAIN,
         SERVICE_WRITE_COIL,
         async_write_coil,
-        schema=service_write_coil_schema,
+        schema=SERVICE_WRITE_COIL_SCHEMA,
     )
\ No newline at end of file
@@ -1,6 +1,8 @@
 """Config flow for Symi Modbus."""
+from functools import lru_cache
 import ipaddress
 import logging
+import re
 from typing import Any, Dict, Optional
 
 import voluptuous as vol
@@ -37,6 +39,8 @@ from .const import (
 
 _LOGGER = logging.getLogger(__name__)
 
+_IPV4_RE = re.compile(r"^\d{1,3}(?:\.\d{1,3}){3}$")
+
 CONNECTION_TYPE_SCHEMA = vol.Schema(
     {
         vol.Required(CONF_TYPE, default=CONF_TCP): vol.In(
@@ -58,17 +62,21 @@ TCP_CONNECTION_SCHEMA = vol.Schema(
 SERIAL_CONNECTION_SCHEMA = vol.Schema(
     {
         vol.Required(CONF_PORT): cv.string,
-        vol.Optional(CONF_BAUDRATE, default=9600): cv.positive_int,
-        vol.Optional(CONF_BYTESIZE, default=8): vol.In([5, 6, 7, 8]),
-        vol.Optional(CONF_PARITY, default="N"): vol.In(["E", "O", "N", "None"]),
-        vol.Optional(CONF_STOPBITS, default=1): vol.In([1, 2]),
-        vol.Optional(CONF_METHOD, default="rtu"): vol.In(["rtu", "ascii"]),
+        vol.Optional(CONF_BAUDRATE, default=9600): vol.All(
+            vol.Coerce(int), vol.Range(min=300, max=921600)
+        ),
+        vol.Optional(CONF_BYTESIZE, default=8): vol.In((5, 6, 7, 8)),
+        vol.Optional(CONF_PARITY, default="N"): vol.In(("E", "O", "N", "None")),
+        vol.Optional(CONF_STOPBITS, default=1): vol.In((1, 2)),
+        vol.Optional(CONF_METHOD, default="rtu"): vol.In(("rtu", "ascii")),
     }
 )
 
 SLAVE_SCHEMA = vol.Schema(
     {
-        vol.Required(CONF_SLAVE, default=DEFAULT_SLAVE): cv.positive_int,
+        vol.Required(CONF_SLAVE, default=DEFAULT_SLAVE): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=247)
+        ),
     }
 )
 
@@ -78,6 +86,17 @@ ADD_ANOTHER_SCHEMA = vol.Schema(
     }
 )
 
+@lru_cache(maxsize=8)
+def _options_schema(default_interval: int) -> vol.Schema:
+    """Return the options schema for a default scan interval."""
+    return vol.Schema(
+        {
+            vol.Optional(CONF_SCAN_INTERVAL, default=default_interval): vol.All(
+                vol.Coerce(int), vol.Range(min=1, max=60)
+            ),
+        }
+    )
+
 class SymiModbusConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Symi Modbus."""
 
@@ -88,8 +107,11 @@ class SymiModbusConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         """Initialize the config flow."""
         self._connection_type = None
         self._connection_data = {}
-        self._slaves = []
+        self._slaves: set[int] = set()
+        self._slaves_hex: list[str] = []
+        self._current_slave_hex: Optional[str] = None
         self._current_slave_data = None
+        self._existing_keys: set[tuple] | None = None
 
     @staticmethod
     @callback
@@ -118,10 +140,14 @@ class SymiModbusConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         """Handle TCP connection configuration."""
         errors = {}
         if user_input is not None:
-            try:
-                ipaddress.ip_address(user_input[CONF_HOST])
-            except ValueError:
-                errors["base"] = "invalid_host"
+            # Only dotted-quad input is validated here; hostnames are left
+            # to the connection attempt to resolve
+            host = user_input[CONF_HOST]
+            if _IPV4_RE.match(host):
+                try:
+                    ipaddress.ip_address(host)
+                except ValueError:
+                    errors["base"] = "invalid_host"
             
             if not errors:
                 self._connection_data = user_input
@@ -151,24 +177,26 @@ class SymiModbusConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             slave = user_input[CONF_SLAVE]
             
             # Check if this slave is already added in Home Assistant
-            # This checks ALL entries in the config, not just the current flow
-            for entry in self._async_current_entries():
-                if entry.data.get(CONF_SLAVE) == slave and entry.data.get(CONF_TYPE) == self._connection_type:
-                    if self._connection_type == CONF_TCP:
-                        host = self._connection_data[CONF_HOST]
-                        port = self._connection_data[CONF_PORT]
-                        entry_host = entry.data.get(CONF_HOST)
-                        entry_port = entry.data.get(CONF_PORT)
-                        if host == entry_host and port == entry_port:
-                            errors["base"] = "already_configured"
-                            break
-                    else:
-                        # For serial connections, just check the port
-                        port = self._connection_data[CONF_PORT]
-                        entry_port = entry.data.get(CONF_PORT)
-                        if port == entry_port:
-                            errors["base"] = "already_configured"
-                            break
+            # This checks ALL entries in the config, not just the current flow.
+            # Serial entries have no host, so their key carries None there.
+            if self._existing_keys is None:
+                self._existing_keys = {
+                    (
+                        entry.data.get(CONF_TYPE),
+                        entry.data.get(CONF_HOST),
+                        entry.data.get(CONF_PORT),
+                        entry.data.get(CONF_SLAVE),
+                    )
+                    for entry in self._async_current_entries()
+                }
+            key = (
+                self._connection_type,
+                self._connection_data.get(CONF_HOST),
+                self._connection_data[CONF_PORT],
+                slave,
+            )
+            if key in self._existing_keys:
+                errors["base"] = "already_configured"
             
             # Also check if this slave was already added in this flow session
             if slave in self._slaves:
@@ -179,18 +207,21 @@ class SymiModbusConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 errors["base"] = "too_many_slaves"
             
             if not errors:
-                self._slaves.append(slave)
+                self._slaves.add(slave)
                 
                 # Generate unique ID and name for this connection + slave
+                slave_hex = format(slave, "02X")
+                self._current_slave_hex = "0x" + slave_hex
+                self._slaves_hex.append(self._current_slave_hex)
                 if self._connection_type == CONF_TCP:
-                    name = f"Modbus TCP {slave:02X}"
+                    name = "Modbus TCP " + slave_hex
                     host = self._connection_data[CONF_HOST]
                     port = self._connection_data[CONF_PORT]
-                    unique_id = f"modbus_tcp_{host}_{port}_{slave:02X}"
+                    unique_id = "_".join(("modbus_tcp", host, str(port), slave_hex))
                 else:
-                    name = f"Modbus Serial {slave:02X}"
+                    name = "Modbus Serial " + slave_hex
                     port = self._connection_data[CONF_PORT]
-                    unique_id = f"modbus_serial_{port}_{slave:02X}"
+                    unique_id = "_".join(("modbus_serial", str(port), slave_hex))
                 
                 # Create connection for this slave
                 self._current_slave_data = {
@@ -213,7 +244,7 @@ class SymiModbusConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             data_schema=SLAVE_SCHEMA,
             errors=errors,
             description_placeholders={
-                "current_slaves": ", ".join([f"0x{s:02X}" for s in self._slaves]) if self._slaves else "无",
+                "current_slaves": ", ".join(self._slaves_hex) if self._slaves else "无",
                 "slave_count": len(self._slaves),
             },
         )
@@ -235,6 +266,7 @@ class SymiModbusConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 # Clear the current slave data and unique ID to avoid conflicts
                 self._current_slave_data = None
                 self.unique_id = None
+                self._existing_keys = None
                 
                 # Return to the slave step
                 return await self.async_step_slave()
@@ -249,7 +281,7 @@ class SymiModbusConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             step_id="add_another",
             data_schema=ADD_ANOTHER_SCHEMA,
             description_placeholders={
-                "slave": f"0x{self._current_slave_data[CONF_SLAVE]:02X}",
+                "slave": self._current_slave_hex,
             },
         )
 
@@ -265,13 +297,9 @@ class SymiModbusOptionsFlow(config_entries.OptionsFlow):
         if user_input is not None:
             return self.async_create_entry(title="", data=user_input)
 
-        options = {
-            vol.Optional(
-                CONF_SCAN_INTERVAL,
-                default=self.config_entry.options.get(
-                    CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
-                ),
-            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=60)),
-        }
-
-        return self.async_show_form(step_id="init", data_schema=vol.Schema(options)) 
\ No newline at end of file
+        return self.async_show_form(
+            step_id="init",
+            data_schema=_options_schema(
+                self.config_entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+            ),
+        ) 
\ No newline at end of file
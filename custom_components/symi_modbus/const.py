@@ -1,6 +1,8 @@
 """Constants for the Symi Modbus integration."""
 from typing import Final
 
+from homeassistant.const import Platform
+
 DOMAIN: Final = "symi_modbus"
 DEFAULT_HUB: Final = "symi_modbus"
 DEFAULT_SCAN_INTERVAL: Final = 1
@@ -9,6 +11,22 @@ DEFAULT_SLAVE: Final = 0x0A
 DEFAULT_TCP_PORT: Final = 502
 DEFAULT_DELAY_MS: Final = 0
 
+# Coil polling: gaps up to MAX_COIL_GAP unused coils are read through rather
+# than split into another request; one read covers at most MAX_READ_COILS
+MAX_COIL_GAP: Final = 16
+MAX_READ_COILS: Final = 2000
+
+# Coil writes arriving within WRITE_COALESCE_DELAY seconds are sent together;
+# one write multiple coils frame covers at most MAX_WRITE_COILS
+WRITE_COALESCE_DELAY: Final = 0.02
+MAX_WRITE_COILS: Final = 1968
+
+# Upper bound in seconds of the poll interval while a hub is not answering
+MAX_POLL_BACKOFF: Final = 60
+
+# hass.data[DOMAIN] key of the hub name -> ModbusHub index
+DATA_HUBS_BY_NAME: Final = "_by_name"
+
 # Device attributes
 ATTR_ADDRESS: Final = "address"
 ATTR_HUB: Final = "hub"
@@ -37,4 +55,4 @@ SERVICE_WRITE_COIL: Final = "write_coil"
 SERVICE_WRITE_REGISTER: Final = "write_register"
 
 # Platforms
-PLATFORMS: Final = ["switch"]
\ No newline at end of file
+PLATFORMS: Final[tuple[Platform, ...]] = (Platform.SWITCH,)
\ No newline at end of file
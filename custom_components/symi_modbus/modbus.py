@@ -1,7 +1,8 @@
 """Symi Modbus integration."""
 import asyncio
 import logging
-from datetime import timedelta
+import random
+import struct
 from typing import Any, Dict, List, Optional, Tuple, Callable, Set
 
 from homeassistant.config_entries import ConfigEntry
@@ -17,7 +18,7 @@ from homeassistant.const import (
     CONF_TYPE,
 )
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
 from .const import (
     ATTR_ADDRESS,
@@ -34,11 +35,28 @@ from .const import (
     DEFAULT_SCAN_INTERVAL,
     DEFAULT_DELAY_MS,
     DOMAIN,
+    MAX_COIL_GAP,
+    MAX_POLL_BACKOFF,
+    MAX_READ_COILS,
+    MAX_WRITE_COILS,
+    WRITE_COALESCE_DELAY,
 )
 from .crc16 import crc16_fn
 
 _LOGGER = logging.getLogger(__name__)
 
+class _SlaveCfg:
+    """Polling configuration of one slave."""
+
+    __slots__ = ("addresses", "runs", "dirty")
+
+    def __init__(self) -> None:
+        """Initialize an empty polling configuration."""
+        self.addresses: Set[int] = set()
+        # (address slots, prebuilt read request) per read coils request
+        self.runs: List[Tuple[Tuple[int, ...], bytes]] = []
+        self.dirty = False
+
 class ModbusHub:
     """Thread safe wrapper class for modbus communication."""
 
@@ -50,13 +68,30 @@ class ModbusHub:
         self._name = self._config[CONF_NAME]
         self._type = self._config[CONF_TYPE]
         self._lock = asyncio.Lock()
-        self._callbacks = []
-        self._scan_interval = self._config.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+        self._scan_interval = entry.options.get(
+            CONF_SCAN_INTERVAL,
+            self._config.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+        )
         self._delay = self._config.get(CONF_DELAY, DEFAULT_DELAY_MS)
-        self._slave_data = {}
-        self._slaves_to_poll = {}
-        self._unsub_poll = None
+        self._slave_data: Dict[int, bytearray] = {}
+        # The hub's poll loop publishes the coil bitmaps; update_method only
+        # serves refreshes requested by entities
+        self.coordinator = DataUpdateCoordinator(
+            hass,
+            _LOGGER,
+            name=f"{DOMAIN} {self._name}",
+            update_method=self._async_refresh_data,
+        )
+        self.coordinator.data = self._slave_data
+        self._last_change: Tuple[Optional[int], int] = (None, 0)
+        self._slaves_to_poll: Dict[int, _SlaveCfg] = {}
+        self._poll_task: Optional[asyncio.Task] = None
         self._in_error = False
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._pending_writes: Dict[int, Dict[int, bool]] = {}
+        self._write_waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._flush_task: Optional[asyncio.Task] = None
         
         # Connection details
         if self._type == CONF_TCP:
@@ -80,18 +115,41 @@ class ModbusHub:
         """Set up the modbus hub."""
         _LOGGER.debug("Setting up Modbus hub %s", self._name)
         
-        # Start polling timer
-        self._unsub_poll = async_track_time_interval(
-            self._hass,
-            self.async_poll_slaves,
-            timedelta(seconds=self._scan_interval),
+        # Start polling loop
+        self._poll_task = self._hass.async_create_background_task(
+            self._async_poll_loop(), f"{DOMAIN} {self._name} poll"
         )
         
         return True
 
-    def add_callback(self, callback_func: Callable):
-        """Register a callback function."""
-        self._callbacks.append(callback_func)
+    @callback
+    def async_update_scan_interval(self, scan_interval: int) -> None:
+        """Use a new scan interval from the next poll on."""
+        self._scan_interval = scan_interval
+
+    async def _async_poll_loop(self) -> None:
+        """Poll slaves every scan interval, backing off while none answer."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
+        failures = 0
+        while True:
+            try:
+                answered = await self.async_poll_slaves()
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Unexpected error polling hub %s", self._name)
+                answered = False
+            
+            if answered:
+                failures = 0
+            elif self._scan_interval << failures < MAX_POLL_BACKOFF:
+                failures += 1
+            
+            # Schedule from the previous deadline so time spent polling does
+            # not push later polls back; jitter keeps hubs sharing a gateway
+            # from polling in lockstep
+            interval = min(self._scan_interval << failures, MAX_POLL_BACKOFF)
+            deadline = max(deadline + interval * random.uniform(0.9, 1.1), loop.time())
+            await asyncio.sleep(deadline - loop.time())
 
     def _log_error(self, error_text: str, error_state=True) -> None:
         """Log error message and set error state."""
@@ -102,66 +160,123 @@ class ModbusHub:
                 _LOGGER.info(error_text)
             self._in_error = error_state
     
+    async def _async_connect(self) -> bool:
+        """Open the TCP connection unless it is already open."""
+        if self._connected():
+            return True
+        
+        try:
+            coro = asyncio.open_connection(self._host, self._port)
+            self._reader, self._writer = await asyncio.wait_for(coro, 1)
+        except Exception as e:
+            self._log_error(f"TCP connection failed: {e}")
+            return False
+        
+        return True
+    
+    def _connected(self) -> bool:
+        """Return whether the open connection can still be used."""
+        # A gateway closing an idle connection only leaves the reader at EOF
+        return (
+            self._writer is not None
+            and not self._writer.is_closing()
+            and not self._reader.at_eof()
+        )
+    
+    def _close(self) -> None:
+        """Close the TCP connection; the next send reconnects."""
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = None
+        self._writer = None
+    
     async def async_send(self, data):
         """Send data over TCP connection."""
         if self._type != CONF_TCP:
             _LOGGER.error("Only TCP connections are currently supported")
             return None
         
-        try:
-            coro = asyncio.open_connection(self._host, self._port)
-            reader, writer = await asyncio.wait_for(coro, 1)
-        except Exception as e:
-            self._log_error(f"TCP connection failed: {e}")
+        # The connection is kept open between requests and only reopened
+        # after an error
+        reused = self._connected()
+        if not await self._async_connect():
             return None
         
-        writer.write(bytes(data))
+        self._writer.write(data)
         try:
-            read = reader.read(20)
-            buf = await asyncio.wait_for(read, 0.5)
-            if len(buf) > 2:
-                return buf
-            else:
-                self._log_error("Received insufficient data")
-                return None
+            return await asyncio.wait_for(self._async_read_response(), 0.5)
+        except asyncio.IncompleteReadError as e:
+            if reused and not e.partial:
+                # The gateway dropped the idle connection before our request
+                # reached it; send it once more on a fresh connection
+                self._close()
+                return await self.async_send(data)
+            self._log_error("Received insufficient data")
         except Exception as e:
             self._log_error(f"Response timeout: {e}")
-            return None
-        finally:
-            writer.close()
+        
+        # Drop the connection so a late reply can't be taken for the next one
+        self._close()
+        return None
+    
+    async def _async_read_response(self):
+        """Read exactly one RTU frame from the open connection."""
+        header = await self._reader.readexactly(3)
+        function_code = header[1]
+        if function_code & 0x80:
+            # Exception response: exception code, then CRC
+            remaining = 2
+        elif function_code in (1, 2, 3, 4):
+            # Read response: byte count, data bytes, then CRC
+            remaining = header[2] + 2
+        else:
+            # Write echo: address and value or quantity, then CRC
+            remaining = 5
+        return header + await self._reader.readexactly(remaining)
     
     def register_slaves_to_poll(self, slave, addresses):
         """Register slaves and addresses to poll."""
-        if slave not in self._slaves_to_poll:
-            self._slaves_to_poll[slave] = {"addresses": []}
+        cfg = self._slaves_to_poll.get(slave)
+        if cfg is None:
+            cfg = self._slaves_to_poll[slave] = _SlaveCfg()
         
         # Add new addresses
-        for address in addresses:
-            if address not in self._slaves_to_poll[slave]["addresses"]:
-                self._slaves_to_poll[slave]["addresses"].append(address)
+        cfg.addresses.update(addresses)
         
-        # Calculate start and count for efficient polling
-        self._slaves_to_poll[slave]["start"] = min(self._slaves_to_poll[slave]["addresses"])
-        max_addr = max(self._slaves_to_poll[slave]["addresses"])
-        self._slaves_to_poll[slave]["count"] = max_addr - self._slaves_to_poll[slave]["start"] + 1
+        # Runs are rebuilt on the next poll, once all entities have registered
+        cfg.dirty = True
         
-        _LOGGER.debug("Registered polling for slave %s, addresses: %s", slave, self._slaves_to_poll[slave]["addresses"])
+        _LOGGER.debug("Registered polling for slave %s, addresses: %s", slave, cfg.addresses)
+    
+    @staticmethod
+    def _coil_ranges(addresses):
+        """Group addresses into (start, end) ranges read with one request each."""
+        ordered = sorted(addresses)
+        ranges = []
+        start = end = ordered[0]
+        for address in ordered[1:]:
+            # Bridge small gaps rather than paying an extra round trip, but
+            # never skip a large gap or exceed the protocol's read limit
+            if address - end - 1 > MAX_COIL_GAP or address - start >= MAX_READ_COILS:
+                ranges.append((start, end))
+                start = address
+            end = address
+        ranges.append((start, end))
+        return ranges
     
-    async def async_req_state(self, slave):
+    @staticmethod
+    def _read_request(slave, start, count):
+        """Build a read coils request frame, CRC included."""
+        data = struct.pack(">BBHH", slave, 1, start, count)
+        return data + crc16_fn(data)
+    
+    async def async_req_state(self, frame):
         """Request coil states from a slave."""
-        start = self._slaves_to_poll[slave]["start"]
-        count = self._slaves_to_poll[slave]["count"]
-        
-        # Create Modbus read coils request
-        data = [slave, 1, 0, start, 0, count]
-        for crc in crc16_fn(data):
-            data.append(crc)
-        
         async with self._lock:
-            response = await self.async_send(data)
+            response = await self.async_send(frame)
             return response
     
-    def handle_state(self, data):
+    def handle_state(self, data, slots):
         """Process state data from response."""
         if len(data) < 3 or data[1] != 1:
             return False
@@ -170,56 +285,198 @@ class ModbusHub:
         if slave not in self._slaves_to_poll:
             return False
         
-        states = {}
-        start = self._slaves_to_poll[slave]["start"]
-        for i in range(data[2]):
-            bits = data[i+3]
-            for j in range(8):
-                addr = start + j + i*8
-                states[addr] = True if bits >> j & 0x01 else False
-        
-        # Store data
-        self._slave_data[slave] = states
+        # Splice the response bits over the run's range of the slave bitmap;
+        # padding bits past the last slot are masked off and coils missing
+        # from a short response read as off
+        start = slots[0]
+        bitmap = self._coil_bitmap(slave, slots[-1])
+        mask = ((1 << len(slots)) - 1) << start
+        old = int.from_bytes(bitmap, "little")
+        new = (old & ~mask) | ((int.from_bytes(data[3:3 + data[2]], "little") << start) & mask)
+        changed = old ^ new
+        if not changed:
+            return True
         
-        # Notify callbacks
-        for callback_func in self._callbacks:
-            callback_func(states, slave)
+        # Store data and let the entities whose coil flipped pick it up
+        bitmap[:] = new.to_bytes(len(bitmap), "little")
+        self._last_change = (slave, changed)
+        self.coordinator.async_set_updated_data(self._slave_data)
         
         return True
     
+    def _coil_bitmap(self, slave, address):
+        """Return the coil bitmap of a slave, grown to hold address."""
+        bitmap = self._slave_data.setdefault(slave, bytearray())
+        size = (address >> 3) + 1
+        if len(bitmap) < size:
+            bitmap.extend(bytes(size - len(bitmap)))
+        return bitmap
+    
+    async def _async_refresh_data(self) -> Dict[int, bytearray]:
+        """Poll all slaves on request and return the coil bitmaps."""
+        await self.async_poll_slaves()
+        # Changed coils were already pushed during the poll; the refresh's own
+        # update must not report them again
+        self._last_change = (None, 0)
+        return self._slave_data
+    
+    def coil_state(self, slave, address) -> Optional[bool]:
+        """Return the last known state of a coil, or None if never seen."""
+        bitmap = self._slave_data.get(slave)
+        if bitmap is None or address >> 3 >= len(bitmap):
+            return None
+        return bool(bitmap[address >> 3] >> (address & 0x07) & 0x01)
+    
+    def coil_changed(self, slave, address) -> bool:
+        """Return True if the last published update flipped a coil."""
+        changed_slave, changed = self._last_change
+        return changed_slave == slave and bool(changed >> address & 0x01)
+    
     def check_crc(self, data):
-        """Check CRC of response data."""
+        """Check CRC of response data, given as bytes or a memoryview."""
         if len(data) < 3:
             return False
-        crc = crc16_fn(data[:-2])
-        return (data[-2] == crc[0]) & (data[-1] == crc[1])
+        view = memoryview(data)
+        return crc16_fn(view[:-2]) == view[-2:]
     
-    async def async_poll_slaves(self, now=None):
-        """Poll all registered slaves."""
-        for slave in self._slaves_to_poll:
-            response = await self.async_req_state(slave)
+    async def _async_poll_slave(self, slave) -> bool:
+        """Poll a single slave and process its response.
+        
+        Returns True if the slave answered at least one request.
+        """
+        cfg = self._slaves_to_poll[slave]
+        if cfg.dirty and cfg.addresses:
+            cfg.dirty = False
+            # The requests never change between polls, so build them once
+            cfg.runs = [
+                (
+                    tuple(range(start, end + 1)),
+                    self._read_request(slave, start, end - start + 1),
+                )
+                for start, end in self._coil_ranges(cfg.addresses)
+            ]
+        
+        answered = False
+        for slots, frame in cfg.runs:
+            response = await self.async_req_state(frame)
             
             if response is None:
                 continue
             
-            if not self.check_crc(response):
+            # Slice through a view so the payload is never copied
+            view = memoryview(response)
+            if not self.check_crc(view):
                 _LOGGER.warning("CRC check failed for slave %s", slave)
                 continue
             
-            self.handle_state(response[:-2])
+            answered = True
+            self.handle_state(view[:-2], slots)
+        
+        return answered
+    
+    async def async_poll_slaves(self) -> bool:
+        """Poll all registered slaves.
+        
+        Returns False if no slave answered.
+        """
+        if not self._slaves_to_poll or next(self.coordinator.async_contexts(), None) is None:
+            return True
+        
+        if not self._delay:
+            if self._type == CONF_TCP:
+                # Each request still holds self._lock while on the wire, but
+                # CRC checks and state handling overlap with other slaves' I/O
+                results = await asyncio.gather(
+                    *(self._async_poll_slave(slave) for slave in self._slaves_to_poll)
+                )
+                return any(results)
             
-            # Small delay between polls if configured
-            if self._delay > 0:
-                await asyncio.sleep(self._delay / 1000)
+            # A serial bus carries one request at a time
+            answered = False
+            for slave in self._slaves_to_poll:
+                answered |= await self._async_poll_slave(slave)
+            return answered
+        
+        # Small delay between polls if configured
+        delay = self._delay / 1000
+        answered = False
+        for slave in self._slaves_to_poll:
+            answered |= await self._async_poll_slave(slave)
+            await asyncio.sleep(delay)
+        return answered
     
     async def write_coil(self, slave, address, value):
-        """Write to a coil."""
-        data = [slave, 5, 0, address, 0, 0]
-        if value:
-            data[4] = 0xff
+        """Write to a coil.
         
-        for crc in crc16_fn(data):
-            data.append(crc)
+        Writes arriving within WRITE_COALESCE_DELAY are sent together, one
+        frame per contiguous range of coils on a slave.
+        """
+        if not 0 <= slave <= 0xFF or not 0 <= address <= 0xFFFF:
+            _LOGGER.error("Invalid coil %s on slave %s", address, slave)
+            return False
+        
+        future = asyncio.get_running_loop().create_future()
+        self._pending_writes.setdefault(slave, {})[address] = bool(value)
+        self._write_waiters.append((slave, address, future))
+        if self._flush_task is None:
+            self._flush_task = self._hass.async_create_task(self._async_flush_writes())
+        return await future
+    
+    async def _async_flush_writes(self):
+        """Send the coil writes collected during the coalescing window."""
+        # Writes queued while a batch is on the wire go out in the next pass
+        # of this task, never in a second flush racing it for the lock
+        while True:
+            await asyncio.sleep(WRITE_COALESCE_DELAY)
+            pending, self._pending_writes = self._pending_writes, {}
+            waiters, self._write_waiters = self._write_waiters, []
+            await self._async_send_writes(pending, waiters)
+            if not self._pending_writes:
+                break
+        self._flush_task = None
+    
+    async def _async_send_writes(self, pending, waiters):
+        """Send one batch of coil writes and resolve its waiters."""
+        results = {}
+        try:
+            for slave, coils in pending.items():
+                ordered = sorted(coils)
+                start = ordered[0]
+                values = [coils[start]]
+                for address in ordered[1:]:
+                    if address == start + len(values) and len(values) < MAX_WRITE_COILS:
+                        values.append(coils[address])
+                        continue
+                    ok = await self._async_write_range(slave, start, values)
+                    results.update(((slave, start + i), ok) for i in range(len(values)))
+                    start = address
+                    values = [coils[address]]
+                ok = await self._async_write_range(slave, start, values)
+                results.update(((slave, start + i), ok) for i in range(len(values)))
+        finally:
+            for slave, address, future in waiters:
+                if not future.done():
+                    future.set_result(results.get((slave, address), False))
+    
+    async def _async_write_range(self, slave, start, values):
+        """Write a range of coils; a failure only fails this range."""
+        try:
+            return await self._async_write_coils(slave, start, values)
+        except Exception:
+            _LOGGER.exception("Error writing coils %s on slave %s", start, slave)
+            return False
+    
+    async def _async_write_coils(self, slave, start, values):
+        """Write a contiguous range of coils."""
+        count = len(values)
+        if count == 1:
+            # Single coils keep using write single coil
+            data = struct.pack(">BBHH", slave, 5, start, 0xFF00 if values[0] else 0)
+        else:
+            bits = sum(1 << i for i, value in enumerate(values) if value)
+            payload = bits.to_bytes((count + 7) // 8, "little")
+            data = struct.pack(">BBHHB", slave, 15, start, count, len(payload)) + payload
+        data += crc16_fn(data)
         
         async with self._lock:
             response = await self.async_send(data)
@@ -230,15 +487,43 @@ class ModbusHub:
                 _LOGGER.warning("CRC check failed for write response")
                 return False
             
-            # Update the state in our local cache
-            if slave in self._slave_data and address in self._slave_data[slave]:
-                self._slave_data[slave][address] = value
+            if response[1] & 0x80:
+                _LOGGER.warning(
+                    "Slave %s rejected coil write with exception code %s", slave, response[2]
+                )
+                return False
+            
+            # Update the state in our local cache and publish the flipped
+            # coils, since the next poll compares against this bitmap
+            bitmap = self._coil_bitmap(slave, start + count - 1)
+            mask = ((1 << count) - 1) << start
+            bits = sum(1 << i for i, value in enumerate(values) if value) << start
+            old = int.from_bytes(bitmap, "little")
+            new = (old & ~mask) | bits
+            changed = old ^ new
+            if changed:
+                bitmap[:] = new.to_bytes(len(bitmap), "little")
+                self._last_change = (slave, changed)
+                self.coordinator.async_set_updated_data(self._slave_data)
             
             return True
     
-    @callback
     async def async_stop(self, event=None):
         """Stop the hub."""
-        if self._unsub_poll is not None:
-            self._unsub_poll()
-            self._unsub_poll = None 
\ No newline at end of file
+        if self._poll_task is not None:
+            poll_task, self._poll_task = self._poll_task, None
+            poll_task.cancel()
+            # Give an in-flight poll a moment to unwind before closing
+            await asyncio.wait((poll_task,), timeout=1)
+        
+        # Fail writes still waiting for the coalescing window
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        for _slave, _address, future in self._write_waiters:
+            if not future.done():
+                future.set_result(False)
+        self._pending_writes = {}
+        self._write_waiters = []
+        
+        self._close() 
\ No newline at end of file
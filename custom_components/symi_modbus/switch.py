@@ -26,7 +26,7 @@ from homeassistant.helpers.update_coordinator import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.device_registry import DeviceInfo
-from homeassistant.helpers.entity import generate_entity_id
+from homeassistant.helpers.entity import async_generate_entity_id
 
 from .const import (
     CONF_SWITCHS,
@@ -66,6 +66,9 @@ async def async_setup_entry(
     
     entities = []
     
+    # Snapshot the taken entity IDs once instead of querying per switch
+    current_ids = set(hass.states.async_entity_ids(DOMAIN))
+    
     # Get slave address from config entry
     slave = config_entry.data.get(CONF_SLAVE, DEFAULT_SLAVE)
     
@@ -81,6 +84,10 @@ async def async_setup_entry(
         display_number = i + 1  # Convert from 0-31 to 1-32 for display
         name = f"{slave:02X}switch{display_number:02d}"
         unique_id = f"{config_entry.entry_id}_{slave}_{address}"
+        entity_id = async_generate_entity_id(
+            ENTITY_ID_FORMAT, f"{name}_{slave}_{address}", current_ids
+        )
+        current_ids.add(entity_id)
         
         entities.append(
             ModbusSwitch(
@@ -89,13 +96,14 @@ async def async_setup_entry(
                 address,
                 name,
                 unique_id,
+                entity_id,
                 display_number,
             )
         )
     
     async_add_entities(entities)
 
-class ModbusSwitch(SwitchEntity):
+class ModbusSwitch(CoordinatorEntity, SwitchEntity):
     """Representation of a Modbus switch."""
 
     def __init__(
@@ -105,10 +113,12 @@ class ModbusSwitch(SwitchEntity):
         address: int,
         name: str,
         unique_id: str,
+        entity_id: str,
         display_number: int,
         device_class: Optional[str] = None,
     ) -> None:
         """Initialize the Modbus switch."""
+        super().__init__(hub.coordinator, context=(slave, address))
         self._hub = hub
         self._slave = slave
         self._address = address
@@ -116,16 +126,7 @@ class ModbusSwitch(SwitchEntity):
         self._name = name
         self._unique_id = unique_id
         self._device_class = device_class
-        self._is_on = False
-        self._available = True
-        
-        # Register callback for state updates
-        self._hub.add_callback(self.async_on_state_change)
-        
-        # Generate entity ID
-        self.entity_id = generate_entity_id(
-            ENTITY_ID_FORMAT, f"{name}_{slave}_{address}", hass=hub._hass
-        )
+        self.entity_id = entity_id
 
     @property
     def name(self) -> str:
@@ -147,53 +148,28 @@ class ModbusSwitch(SwitchEntity):
             model="Modbus Switch Module",
         )
 
-    @property
-    def available(self) -> bool:
-        """Return True if entity is available."""
-        return self._available
-
     @property
     def is_on(self) -> bool:
         """Return true if switch is on."""
-        return self._is_on
+        return bool(self._hub.coil_state(self._slave, self._address))
 
     @property
     def device_class(self) -> Optional[str]:
         """Return the device class."""
         return self._device_class
 
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only when this switch's coil changed."""
+        if self._hub.coil_changed(self._slave, self._address):
+            super()._handle_coordinator_update()
+
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the switch on."""
         await self._hub.write_coil(self._slave, self._address, True)
-        self._is_on = True
         self.async_write_ha_state()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the switch off."""
         await self._hub.write_coil(self._slave, self._address, False)
-        self._is_on = False
         self.async_write_ha_state()
-
-    @callback
-    def async_on_state_change(self, data, slave):
-        """Update state when state changes."""
-        if slave != self._slave:
-            return
-            
-        if not self._available:
-            self._available = True
-            
-        if self._address in data:
-            new_state = data[self._address]
-            if new_state != self._is_on:
-                self._is_on = new_state
-                self.async_write_ha_state()
-                
-    async def async_added_to_hass(self) -> None:
-        """Register callbacks."""
-        # Initial update
-        if self._slave in self._hub._slave_data:
-            data = self._hub._slave_data[self._slave]
-            if self._address in data:
-                self._is_on = data[self._address]
-                self._available = True 
\ No newline at end of file